@@ -1,5 +1,12 @@
 import requests
 import json
+import time
+
+try:
+    from websockets.exceptions import WebSocketException
+    from websockets.sync.client import connect as ws_connect
+except ImportError:  # optional: fall back to polling the job status URL
+    ws_connect = None
 
 url = "http://localhost:5001/processes/geometry-buffer/execution"
 
@@ -19,44 +26,86 @@ payload = {
 
 headers = {"Prefer": "respond-async"}
 
+POLL_INTERVAL_S = 2.0
+POLL_TIMEOUT_S = 60.0
+
+# Reuse one keep-alive connection for the POST and every status request
+session = requests.Session()
+
+
+def watch_job_ws(job_url, deadline):
+    """Follow the job over its WebSocket endpoint until it finishes.
+
+    Returns the final status document, or None when websockets is not
+    installed, the server does not offer the endpoint (e.g. 404 / 426), or
+    no final status arrives before the time.monotonic() deadline.
+    """
+    if ws_connect is None:
+        return None
+    ws_url = "ws" + job_url.rstrip("/")[len("http"):] + "/ws"
+    try:
+        with ws_connect(ws_url, open_timeout=max(0.0, deadline - time.monotonic())) as ws:
+            print(f"Watching job over WebSocket: {ws_url}")
+            while True:
+                message = ws.recv(timeout=max(0.0, deadline - time.monotonic()))
+                status_json = json.loads(message)
+                status = status_json.get("status")
+                print(f"Current Status: {status}")
+                if status in ["successful", "failed", "dismissed"]:
+                    return status_json
+    except TimeoutError:
+        print("No final status over WebSocket before the deadline")
+    except (WebSocketException, OSError):
+        pass
+    return None
+
+
 print(f"Sending POST request to: {url}")
 print("Headers:", headers)
 print("\nRequest Payload:")
 print(json.dumps(payload, indent=2))
 
 try:
-    response = requests.post(url, json=payload, headers=headers)
+    response = session.post(url, json=payload, headers=headers)
 
     if response.status_code == 201:
         print("\nResponse Status Code: 201 Created (Async job accepted)")
         job_url = response.headers.get("Location")
         print(f"Tracking Job at: {job_url}")
 
-        # Poll for job completion
-        import time
-
-        while True:
-            time.sleep(2)
-            print("Polling status...")
-            status_res = requests.get(job_url)
-            status_json = status_res.json()
-            status = status_json.get("status")
-            print(f"Current Status: {status}")
-
-            if status == "successful":
-                print("\nJob completed successfully! Fetching results...")
-                results_res = requests.get(f"{job_url}/results?f=json")
-                print("Final Buffer GeoJSON Geometry:")
-                try:
-                    # Attempt to parse json directly
-                    print(json.dumps(results_res.json(), indent=2))
-                except json.JSONDecodeError:
-                    # If it's returning raw text or stringified JSON rather than application/json mime
-                    print(results_res.text)
-                break
-            elif status in ["failed", "dismissed"]:
-                print(f"Job failed with status: {status}")
-                break
+        deadline = time.monotonic() + POLL_TIMEOUT_S
+        status_json = watch_job_ws(job_url, deadline)
+
+        # Poll for job completion if the WebSocket gave no final status.
+        # Poll at least once, so a WebSocket that timed out still reports
+        # the job's current status.
+        if status_json is None:
+            while True:
+                time.sleep(POLL_INTERVAL_S)
+                print("Polling status...")
+                status_res = session.get(job_url)
+                status_json = status_res.json()
+                status = status_json.get("status")
+                print(f"Current Status: {status}")
+
+                if status in ["successful", "failed", "dismissed"] or time.monotonic() >= deadline:
+                    break
+
+        status = status_json.get("status") if status_json else None
+        if status == "successful":
+            print("\nJob completed successfully! Fetching results...")
+            results_res = session.get(f"{job_url}/results?f=json")
+            print("Final Buffer GeoJSON Geometry:")
+            try:
+                # Attempt to parse json directly
+                print(json.dumps(results_res.json(), indent=2))
+            except json.JSONDecodeError:
+                # If it's returning raw text or stringified JSON rather than application/json mime
+                print(results_res.text)
+        elif status in ["failed", "dismissed"]:
+            print(f"Job failed with status: {status}")
+        else:
+            print(f"Job did not finish within {POLL_TIMEOUT_S:.0f}s (last status: {status})")
 
     else:
         print(f"\nRequest failed with status code: {response.status_code}")
@@ -0,0 +1,129 @@
+# =================================================================
+# Numba kernels for the geometry buffer fast path.
+# numba is optional; NUMBA_AVAILABLE is False when it is not installed
+# and callers fall back to GEOS.
+#
+# Kernels are declared with explicit signatures, so they are compiled
+# when this module is imported rather than on the first request, and
+# cached on disk (NUMBA_CACHE_DIR) for later worker starts. Callers
+# must pass float64 coordinates (C-contiguous except for open_ccw_ring)
+# and an int64 quad_segs.
+# =================================================================
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit('float64[:, ::1](float64[:, :])', cache=True)
+def open_ccw_ring(coords: np.ndarray) -> np.ndarray:
+    """
+    Open, counter-clockwise (N, 2) copy of a ring without repeated vertices.
+
+    Any Z column is ignored, and the closing vertex counts as a repeat of
+    the first. Orientation comes from the sign of the shoelace area.
+    """
+    n = coords.shape[0]
+    out = np.empty((n, 2))
+    m = 0
+    for i in range(n):
+        x = coords[i, 0]
+        y = coords[i, 1]
+        if m > 0 and x == out[m - 1, 0] and y == out[m - 1, 1]:
+            continue
+        out[m, 0] = x
+        out[m, 1] = y
+        m += 1
+    while m > 1 and out[m - 1, 0] == out[0, 0] and out[m - 1, 1] == out[0, 1]:
+        m -= 1
+
+    area2 = 0.0
+    for i in range(m):
+        area2 += out[i - 1, 0] * out[i, 1] - out[i, 0] * out[i - 1, 1]
+    if area2 < 0.0:
+        return out[:m][::-1].copy()
+    return out[:m].copy()
+
+
+@njit('boolean(float64[:, ::1])', cache=True)
+def is_convex_ring(coords: np.ndarray) -> bool:
+    """
+    True if an open, counter-clockwise ring is convex and simple.
+
+    Every turn must be to the left, and the turns must add up to exactly
+    one full revolution (a self-intersecting star also only turns left).
+    """
+    n = coords.shape[0]
+    if n < 3:
+        return False
+    total = 0.0
+    for i in range(n):
+        ax = coords[i, 0] - coords[i - 1, 0]
+        ay = coords[i, 1] - coords[i - 1, 1]
+        bx = coords[(i + 1) % n, 0] - coords[i, 0]
+        by = coords[(i + 1) % n, 1] - coords[i, 1]
+        cross = ax * by - ay * bx
+        if cross < 0.0:
+            return False
+        total += np.arctan2(cross, ax * bx + ay * by)
+    return abs(total - 2.0 * np.pi) < 1e-9
+
+
+@njit('float64[:, ::1](float64[:, ::1], float64, int64)',
+      cache=True, fastmath=True)
+def offset_ring(coords: np.ndarray, dist: float, quad_segs: int) -> np.ndarray:
+    """
+    Outward offset of a convex, counter-clockwise ring with round joins.
+
+    :param coords: (N, 2) open ring, convex and counter-clockwise
+    :param dist: offset distance, > 0
+    :param quad_segs: segments per quarter circle for the joins
+    :returns: (M, 2) closed, counter-clockwise ring
+    """
+    n = coords.shape[0]
+    step = 0.5 * np.pi / quad_segs
+
+    # Angle of the outward normal of each edge i -> i + 1
+    normals = np.empty(n)
+    for i in range(n):
+        dx = coords[(i + 1) % n, 0] - coords[i, 0]
+        dy = coords[(i + 1) % n, 1] - coords[i, 1]
+        normals[i] = np.arctan2(-dx, dy)
+
+    # Each vertex gets an arc from the previous edge's normal to the next
+    sweeps = np.empty(n)
+    segs = np.empty(n, dtype=np.int64)
+    total = 0
+    for i in range(n):
+        sweep = (normals[i] - normals[i - 1]) % (2.0 * np.pi)
+        sweeps[i] = sweep
+        # Turns narrower than one arc step (dense or collinear vertices)
+        # contribute a single point, on the bisector of the turn
+        segs[i] = int(sweep / step + 0.5) if sweep >= step else 0
+        total += segs[i] + 1
+
+    out = np.empty((total + 1, 2))
+    k = 0
+    for i in range(n):
+        start = normals[i - 1]
+        for j in range(segs[i] + 1):
+            if segs[i] == 0:
+                angle = start + 0.5 * sweeps[i]
+            else:
+                angle = start + sweeps[i] * j / segs[i]
+            out[k, 0] = coords[i, 0] + dist * np.cos(angle)
+            out[k, 1] = coords[i, 1] + dist * np.sin(angle)
+            k += 1
+    out[k, 0] = out[0, 0]
+    out[k, 1] = out[0, 1]
+    return out
+
@@ -5,12 +5,45 @@
 
 import json
 import logging
-from typing import Any, Tuple
+from functools import lru_cache
+from itertools import chain
+from typing import Any, List, Optional, Tuple
 
+import numpy as np
+import shapely
 from pygeoapi.process.base import BaseProcessor, ProcessorExecuteError
+from shapely.geometry import mapping, shape
+
+from ._buffer_kernels import (
+    NUMBA_AVAILABLE, is_convex_ring, offset_ring, open_ccw_ring)
 
 LOGGER = logging.getLogger(__name__)
 
+SHAPELY_2 = int(shapely.__version__.split('.')[0]) >= 2
+
+# shapely.from_geojson() wraps the GEOS GeoJSON reader added in GEOS 3.10
+HAS_GEOJSON_READER = SHAPELY_2 and shapely.geos_version >= (3, 10, 0)
+
+# Highest resolution routed to the closed-form point buffer and the numba
+# kernel; above it GEOS is used
+FAST_BUFFER_MAX_RESOLUTION = 16
+
+# Fewest input vertices routed to the numba kernel. Below this the fixed
+# cost of building the output polygon outweighs the kernel's gain
+FAST_BUFFER_MIN_VERTICES = 32
+
+# Default simplification tolerance, as a fraction of the buffer distance
+DEFAULT_SIMPLIFY_RATIO = 0.01
+
+# shapely < 2 ships its C-accelerated coordinate paths behind an opt-in
+# switch; 2.x always uses them and no longer exposes speedups.enable().
+if not SHAPELY_2:
+    try:
+        from shapely import speedups
+        speedups.enable()
+    except (ImportError, AttributeError):
+        LOGGER.warning('shapely speedups are not available')
+
 PROCESS_METADATA = {
     'version': '1.0.0',
     'id': 'geometry-buffer',
@@ -31,19 +64,43 @@ PROCESS_METADATA = {
     'inputs': {
         'geometry': {
             'title': 'Input Geometry',
-            'description': 'A GeoJSON geometry object (Point, LineString, Polygon, etc.)',
+            'description': (
+                'A GeoJSON geometry (Point, LineString, Polygon, etc.), as an '
+                'object or as a serialized GeoJSON string'
+            ),
             'schema': {
-                'type': 'object',
+                'oneOf': [{'type': 'object'}, {'type': 'string'}],
             },
-            'minOccurs': 1,
+            'minOccurs': 0,
             'maxOccurs': 1,
             'keywords': ['geometry', 'geojson'],
         },
+        'geometries': {
+            'title': 'Input Geometries',
+            'description': (
+                'A FeatureCollection or array of GeoJSON geometries, buffered '
+                'in a single batch. Used instead of geometry; returns a '
+                'FeatureCollection'
+            ),
+            'schema': {
+                'oneOf': [{'type': 'object'}, {'type': 'array'}],
+            },
+            'minOccurs': 0,
+            'maxOccurs': 1,
+            'keywords': ['geometry', 'geojson', 'batch'],
+        },
         'distance': {
             'title': 'Buffer Distance',
-            'description': 'Buffer distance in the units of the input CRS (degrees for WGS84)',
+            'description': (
+                'Buffer distance in the units of the input CRS (degrees for '
+                'WGS84). With geometries, either one distance for all inputs '
+                'or an array with one distance per geometry'
+            ),
             'schema': {
-                'type': 'number',
+                'oneOf': [
+                    {'type': 'number'},
+                    {'type': 'array', 'items': {'type': 'number'}},
+                ],
             },
             'minOccurs': 1,
             'maxOccurs': 1,
@@ -60,11 +117,43 @@ PROCESS_METADATA = {
             'maxOccurs': 1,
             'keywords': ['resolution', 'segments'],
         },
+        'simplify': {
+            'title': 'Simplify',
+            'description': (
+                'Simplify the input before buffering, dropping vertices '
+                'whose detail the buffer would smooth away anyway '
+                '(default: false)'
+            ),
+            'schema': {
+                'type': 'boolean',
+                'default': False,
+            },
+            'minOccurs': 0,
+            'maxOccurs': 1,
+            'keywords': ['simplify'],
+        },
+        'simplify_ratio': {
+            'title': 'Simplify Ratio',
+            'description': (
+                'Simplification tolerance as a fraction of the buffer '
+                'distance, used when simplify is true (default: 0.01)'
+            ),
+            'schema': {
+                'type': 'number',
+                'default': DEFAULT_SIMPLIFY_RATIO,
+            },
+            'minOccurs': 0,
+            'maxOccurs': 1,
+            'keywords': ['simplify', 'tolerance'],
+        },
     },
     'outputs': {
         'buffered_geometry': {
             'title': 'Buffered Geometry',
-            'description': 'The resulting buffered GeoJSON geometry',
+            'description': (
+                'The resulting buffered GeoJSON Feature, or a '
+                'FeatureCollection when geometries was given'
+            ),
             'schema': {
                 'type': 'object',
                 'contentMediaType': 'application/json',
@@ -84,44 +173,283 @@ PROCESS_METADATA = {
 }
 
 
+def _offsets(lengths: List[int]) -> np.ndarray:
+    return np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+
+
+def _flatten_coordinates(geom_type: str, coordinates: List) -> Tuple[List, Tuple]:
+    """
+    Split GeoJSON nested coordinates into one flat list of positions and
+    the offset arrays shapely.from_ragged_array() expects for geom_type.
+    """
+    if geom_type == 'Point':
+        return [coordinates], ()
+    if geom_type in ('MultiPoint', 'LineString'):
+        return coordinates, (_offsets([len(coordinates)]),)
+    if geom_type in ('MultiLineString', 'Polygon'):
+        return list(chain.from_iterable(coordinates)), (
+            _offsets([len(part) for part in coordinates]),
+            _offsets([len(coordinates)]),
+        )
+    rings = list(chain.from_iterable(coordinates))
+    return list(chain.from_iterable(rings)), (
+        _offsets([len(ring) for ring in rings]),
+        _offsets([len(polygon) for polygon in coordinates]),
+        _offsets([len(coordinates)]),
+    )
+
+
+def _positions(geometry_input: dict) -> List:
+    """All positions of a GeoJSON geometry, in order, as one flat list."""
+    if geometry_input.get('type') == 'GeometryCollection':
+        return list(chain.from_iterable(
+            _positions(g) for g in geometry_input.get('geometries') or []))
+    coordinates = geometry_input.get('coordinates')
+    if not coordinates:
+        return []
+    return _flatten_coordinates(geometry_input['type'], coordinates)[0]
+
+
+# GeoJSON types built with shapely.from_ragged_array(): the whole geometry
+# is copied into GEOS from one flat coordinate array instead of tuple by
+# tuple the way shape() does.
+_RAGGED_TYPES = {
+    name: shapely.GeometryType[name.upper()]
+    for name in ('Point', 'MultiPoint', 'LineString', 'MultiLineString',
+                 'Polygon', 'MultiPolygon')
+} if SHAPELY_2 else {}
+
+
+def _coordinate_lists(geoms: np.ndarray, include_z: bool) -> List[List]:
+    """Coordinates of each geometry in geoms as nested lists, in one copy."""
+    if len(geoms) == 0:
+        return []
+    coords = shapely.get_coordinates(geoms, include_z=include_z)
+    counts = shapely.get_num_coordinates(geoms)
+    return [part.tolist() for part in np.split(coords, np.cumsum(counts)[:-1])]
+
+
+def _polygonal_to_geojson(geom: Any) -> dict:
+    """
+    Serialize a Polygon or MultiPolygon to a GeoJSON dict.
+
+    Coordinates are copied out of GEOS in bulk and split back into rings,
+    instead of walking them one tuple at a time.
+    """
+    parts = shapely.get_parts(geom)
+    include_z = geom.has_z
+    polygons = [[] for _ in range(len(parts))]
+
+    # Polygons without holes (most buffer output) are just their shell,
+    # so all of them are read in a single call without extracting rings
+    num_holes = shapely.get_num_interior_rings(parts)
+    hole_free_idx = np.flatnonzero((num_holes == 0) & ~shapely.is_empty(parts))
+    shells = _coordinate_lists(parts[hole_free_idx], include_z)
+    for idx, shell in zip(hole_free_idx, shells):
+        polygons[idx] = [shell]
+
+    for idx in np.flatnonzero(num_holes > 0):
+        polygons[idx] = _coordinate_lists(
+            shapely.get_rings(parts[idx]), include_z)
+
+    if geom.geom_type == 'Polygon':
+        return {'type': 'Polygon', 'coordinates': polygons[0] if polygons else []}
+    return {'type': 'MultiPolygon', 'coordinates': polygons}
+
+
+def _read_geometry(geometry_input: Any) -> Tuple[Any, np.ndarray]:
+    """
+    Convert a GeoJSON geometry to a Shapely geometry.
+
+    Serialized GeoJSON (str or bytes) is handed to the GEOS reader as-is,
+    so it is parsed once in C rather than into Python dicts first.
+
+    :returns: tuple of (geometry, coordinates), where coordinates holds
+              every position of the input as one (N, 2) or (N, 3)
+              float64 array
+    """
+    try:
+        if isinstance(geometry_input, (str, bytes)):
+            if HAS_GEOJSON_READER:
+                geom = shapely.from_geojson(geometry_input)
+                return geom, shapely.get_coordinates(
+                    geom, include_z=geom.has_z)
+            geometry_input = json.loads(geometry_input)
+
+        geom_type = geometry_input.get('type')
+        coordinates = geometry_input.get('coordinates')
+        if geom_type in _RAGGED_TYPES and coordinates:
+            positions, offsets = _flatten_coordinates(geom_type, coordinates)
+            # from_ragged_array() crashes the process on empty parts,
+            # rings or lines, so those go through shape() instead
+            if all(np.diff(level).all() for level in offsets):
+                coords = np.asarray(positions, dtype=np.float64)
+                geom = shapely.from_ragged_array(
+                    _RAGGED_TYPES[geom_type], coords, offsets or None)[0]
+                return geom, coords
+
+        geom = shape(geometry_input)
+        coords = np.asarray(_positions(geometry_input), dtype=np.float64)
+        return geom, coords
+    except Exception as err:
+        raise ProcessorExecuteError(
+            f'Invalid GeoJSON geometry: {err}')
+
+
+def _write_geometry(geom: Any) -> dict:
+    """Convert a Shapely geometry to a GeoJSON geometry dict."""
+    if SHAPELY_2 and geom.geom_type in ('Polygon', 'MultiPolygon'):
+        return _polygonal_to_geojson(geom)
+    return mapping(geom)
+
+
+def _num_coordinates(geom: Any) -> int:
+    if SHAPELY_2:
+        return int(shapely.get_num_coordinates(geom))
+    return len(_positions(mapping(geom)))
+
+
+@lru_cache(maxsize=FAST_BUFFER_MAX_RESOLUTION)
+def _unit_circle(resolution: int) -> np.ndarray:
+    """
+    Closed unit-circle ring matching GEOS point buffers: 4 * resolution
+    segments, starting due east and running clockwise.
+    """
+    theta = np.linspace(0.0, -2.0 * np.pi, 4 * resolution + 1)
+    ring = np.column_stack((np.cos(theta), np.sin(theta)))
+    ring[-1] = ring[0]
+    ring.flags.writeable = False
+    return ring
+
+
+def _point_buffer(geom: Any, distance: float,
+                  resolution: int) -> Optional[Any]:
+    """
+    Buffer a Point by scaling a cached unit circle instead of calling
+    GEOS. Returns None for anything else.
+    """
+    if (not SHAPELY_2 or geom.geom_type != 'Point' or geom.is_empty
+            or not np.isfinite(distance) or distance <= 0
+            or not 1 <= resolution <= FAST_BUFFER_MAX_RESOLUTION):
+        return None
+
+    ring = _unit_circle(resolution) * distance + (geom.x, geom.y)
+    return shapely.polygons(ring)
+
+
+def _fast_convex_buffer(geom: Any, coords: np.ndarray, distance: float,
+                        resolution: int) -> Optional[Any]:
+    """
+    Buffer a convex Polygon without holes using the numba offset kernel.
+
+    For that case the buffer is just the shell pushed outwards with a
+    round join at every vertex, so GEOS' general noding is not needed.
+    Returns None whenever the input is outside what the kernel handles.
+
+    :param coords: the input coordinates as returned by _read_geometry(),
+                   i.e. the shell for a Polygon without holes
+    """
+    if not (NUMBA_AVAILABLE and SHAPELY_2):
+        return None
+    if (geom.geom_type != 'Polygon' or distance <= 0
+            or not 1 <= resolution <= FAST_BUFFER_MAX_RESOLUTION
+            or coords.shape[0] < FAST_BUFFER_MIN_VERTICES
+            or shapely.get_num_interior_rings(geom) != 0):
+        return None
+
+    # Repeated vertices, including the closing one, have no edge to take
+    # a normal from
+    coords = open_ccw_ring(coords)
+    if not is_convex_ring(coords):
+        return None
+
+    LOGGER.debug('Using numba convex polygon buffer')
+    ring = offset_ring(coords, float(distance), np.int64(resolution))
+    # GEOS emits buffer shells clockwise; keep the output orientation
+    return shapely.polygons(ring[::-1])
+
+
+def _unpack_geometries(geometries_input: Any) -> List:
+    """Return the list of GeoJSON geometries from a FeatureCollection or array."""
+    if isinstance(geometries_input, dict):
+        if geometries_input.get('type') != 'FeatureCollection':
+            raise ProcessorExecuteError(
+                'geometries must be a FeatureCollection or an array')
+        geometries_input = geometries_input.get('features') or []
+
+    if not isinstance(geometries_input, list):
+        raise ProcessorExecuteError(
+            'geometries must be a FeatureCollection or an array')
+
+    return [
+        item.get('geometry')
+        if isinstance(item, dict) and item.get('type') == 'Feature'
+        else item
+        for item in geometries_input
+    ]
+
+
 class GeometryBufferProcessor(BaseProcessor):
     def __init__(self, processor_def: dict):
         super().__init__(processor_def, PROCESS_METADATA)
 
     def execute(self, data: dict, outputs=None) -> Tuple[str, Any]:
         """
-        :param data: dict with keys 'geometry', 'distance', and optional 'resolution'
+        :param data: dict with keys 'geometry' or 'geometries', 'distance',
+                     and optional 'resolution', 'simplify', 'simplify_ratio'
         :returns: tuple of (mimetype, result_dict)
         """
         mimetype = 'application/json'
 
         geometry_input = data.get('geometry')
-        if geometry_input is None:
+        geometries_input = data.get('geometries')
+        if geometry_input is None and geometries_input is None:
             raise ProcessorExecuteError('Missing required input: geometry')
+        if geometry_input is not None and geometries_input is not None:
+            raise ProcessorExecuteError(
+                'Provide either geometry or geometries, not both')
 
         distance = data.get('distance')
         if distance is None:
             raise ProcessorExecuteError('Missing required input: distance')
 
+        resolution = int(data.get('resolution', 16))
+
+        # Simplification is opt-in so the default output is unchanged;
+        # a ratio of 0 disables it
+        simplify_ratio = 0.0
+        if data.get('simplify', False):
+            try:
+                simplify_ratio = float(
+                    data.get('simplify_ratio', DEFAULT_SIMPLIFY_RATIO))
+            except (TypeError, ValueError):
+                raise ProcessorExecuteError('simplify_ratio must be a number')
+
+        if geometries_input is not None:
+            return mimetype, self._execute_batch(
+                geometries_input, distance, resolution, simplify_ratio)
+
         try:
             distance = float(distance)
         except (TypeError, ValueError):
             raise ProcessorExecuteError('distance must be a number')
-
-        resolution = int(data.get('resolution', 16))
+        if not np.isfinite(distance):
+            raise ProcessorExecuteError('distance must be finite')
 
         # --- Convert GeoJSON to Shapely geometry ---
-        try:
-            from shapely.geometry import shape, mapping
-        except ImportError:
-            raise ProcessorExecuteError(
-                'shapely is required but not installed')
+        geom, coords = _read_geometry(geometry_input)
+        n_vertices = coords.shape[0]
 
-        try:
-            geom = shape(geometry_input)
-        except Exception as err:
-            raise ProcessorExecuteError(
-                f'Invalid GeoJSON geometry: {err}')
+        # --- Optionally simplify ---
+        # Detail much finer than the buffer distance is smoothed out by
+        # the buffer anyway, but GEOS still pays for every vertex
+        tolerance = distance * simplify_ratio
+        simplified = (tolerance > 0
+                      and geom.geom_type not in ('Point', 'MultiPoint'))
+        if simplified:
+            geom = geom.simplify(tolerance, preserve_topology=True)
+            if SHAPELY_2:
+                coords = shapely.get_coordinates(geom, include_z=geom.has_z)
 
         LOGGER.info(
             f'Buffering {geom.geom_type} by distance={distance}, '
@@ -129,22 +457,105 @@ class GeometryBufferProcessor(BaseProcessor):
         )
 
         # --- Compute buffer ---
-        buffered = geom.buffer(distance, resolution=resolution)
+        buffered = _point_buffer(geom, distance, resolution)
+        if buffered is None:
+            buffered = _fast_convex_buffer(geom, coords, distance, resolution)
+        if buffered is None:
+            if SHAPELY_2:
+                buffered = shapely.buffer(geom, distance, quad_segs=resolution)
+            else:
+                buffered = geom.buffer(distance, resolution=resolution)
 
         # --- Build output ---
         result = {
             'type': 'Feature',
-            'geometry': mapping(buffered),
+            'geometry': _write_geometry(buffered),
             'properties': {
                 'input_geometry_type': geom.geom_type,
+                'n_vertices': n_vertices,
                 'buffer_distance': distance,
                 'buffer_resolution': resolution,
                 'result_geometry_type': buffered.geom_type,
                 'result_area': buffered.area,
             },
         }
+        if simplified:
+            result['properties']['simplified_vertex_count'] = (
+                _num_coordinates(geom))
 
         return mimetype, result
 
+    def _execute_batch(self, geometries_input: Any, distance: Any,
+                       resolution: int, simplify_ratio: float = 0.0) -> dict:
+        """
+        Buffer many geometries in one vectorized shapely.buffer() call.
+
+        :param geometries_input: FeatureCollection or array of GeoJSON geometries
+        :param distance: a single distance, or one distance per geometry
+        :param resolution: quarter-circle segments, shared by all geometries
+        :param simplify_ratio: simplification tolerance as a fraction of
+                               each distance; 0 disables simplification
+        :returns: FeatureCollection of buffered features, in input order
+        """
+        if not SHAPELY_2:
+            raise ProcessorExecuteError(
+                'geometries input requires shapely >= 2.0')
+
+        inputs = [_read_geometry(g) for g in _unpack_geometries(geometries_input)]
+        geoms = np.array([geom for geom, _ in inputs], dtype=object)
+        n_vertices = [coords.shape[0] for _, coords in inputs]
+
+        try:
+            distances = np.asarray(distance, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ProcessorExecuteError(
+                'distance must be a number or an array of numbers')
+        if distances.ndim > 1 or (
+                distances.ndim == 1 and distances.shape[0] != geoms.shape[0]):
+            raise ProcessorExecuteError(
+                'distance array must have one value per geometry')
+        if not np.isfinite(distances).all():
+            raise ProcessorExecuteError('distance must be finite')
+        distances = np.broadcast_to(distances, geoms.shape)
+
+        tolerances = distances * simplify_ratio
+        # Points have nothing to simplify, matching the single-geometry path
+        to_simplify = (tolerances > 0) & ~np.isin(
+            shapely.get_type_id(geoms),
+            [shapely.GeometryType.POINT, shapely.GeometryType.MULTIPOINT])
+        if to_simplify.any():
+            geoms[to_simplify] = shapely.simplify(
+                geoms[to_simplify], tolerances[to_simplify],
+                preserve_topology=True)
+
+        LOGGER.info(
+            f'Buffering {geoms.shape[0]} geometries, resolution={resolution}')
+
+        buffered = shapely.buffer(geoms, distances, quad_segs=resolution)
+        areas = shapely.area(buffered)
+        simplified_counts = shapely.get_num_coordinates(geoms)
+
+        features = []
+        for geom, n, out, dist, area, simplified, n_simplified in zip(
+                geoms, n_vertices, buffered, distances, areas, to_simplify,
+                simplified_counts):
+            properties = {
+                'input_geometry_type': geom.geom_type,
+                'n_vertices': n,
+                'buffer_distance': float(dist),
+                'buffer_resolution': resolution,
+                'result_geometry_type': out.geom_type,
+                'result_area': float(area),
+            }
+            if simplified:
+                properties['simplified_vertex_count'] = int(n_simplified)
+            features.append({
+                'type': 'Feature',
+                'geometry': _write_geometry(out),
+                'properties': properties,
+            })
+
+        return {'type': 'FeatureCollection', 'features': features}
+
     def __repr__(self) -> str:
-        return f'<GeometryBufferProcessor> {self.name}'
\ No newline at end of file
+        return f'<GeometryBufferProcessor> {self.name}'
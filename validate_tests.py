@@ -1,28 +1,63 @@
 #!/usr/bin/env python3
 """
 Usage:
-    python validate_tests.py [BASE_URL]
+    python validate_tests.py [BASE_URL] [--no-cache]
 
 Default BASE_URL: http://localhost:5001
+
+--no-cache  fetch read-only endpoints from the server every time instead of
+            reusing the first response for a path
 """
 
+import argparse
 import asyncio
-import json
-import statistics
 import sys
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
+import numpy as np
+import orjson
+
+try:
+    import websockets
+except ImportError:  # optional: only needed to follow jobs over WebSocket
+    websockets = None
 
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
-BASE_URL: str = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:5001"
+_parser = argparse.ArgumentParser(description="OGC API – Processes validation suite")
+_parser.add_argument("base_url", nargs="?", default="http://localhost:5001")
+_parser.add_argument(
+    "--no-cache", action="store_true", help="always fetch read-only endpoints fresh"
+)
+_args = _parser.parse_args()
+
+BASE_URL: str = _args.base_url
+USE_CACHE: bool = not _args.no_cache
 ASYNC_POLL_INTERVAL_S: float = 1.0
 ASYNC_POLL_TIMEOUT_S: float = 30.0
 
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]"). httpx
+# negotiates it over TLS (ALPN) and stays on HTTP/1.1 for plain http:// URLs.
+try:
+    import h2  # noqa: F401
+
+    HTTP2: bool = True
+except ImportError:
+    HTTP2 = False
+
+# One pooled client for every synchronous request, so the suite reuses
+# keep-alive connections instead of opening a new one per call.
+CLIENT = httpx.Client(
+    base_url=BASE_URL,
+    timeout=10.0,
+    headers={"Content-Type": "application/json"},
+    http2=HTTP2,
+)
+
 # ---------------------------------------------------------------------------
 # ANSI helpers
 # ---------------------------------------------------------------------------
@@ -81,13 +116,14 @@ class Results:
         print()
         bold("── Performance Metrics ──────────────────────────")
         for name, values in self.latencies_ms.items():
-            mn = min(values)
-            mx = max(values)
-            avg = statistics.mean(values)
-            p50 = statistics.median(values)
+            arr = np.asarray(values, dtype=np.float64)
+            mn, mx = arr.min(), arr.max()
+            avg = arr.mean()
+            p50, p95, p99 = np.percentile(arr, [50, 95, 99])
             print(
                 f"  {name:35s}  "
-                f"min={mn:.0f}ms  p50={p50:.0f}ms  avg={avg:.0f}ms  max={mx:.0f}ms"
+                f"min={mn:.0f}ms  p50={p50:.0f}ms  p95={p95:.0f}ms  p99={p99:.0f}ms  "
+                f"avg={avg:.0f}ms  max={mx:.0f}ms"
             )
         bold("─" * 48)
 
@@ -96,15 +132,14 @@ results = Results()
 
 
 # ---------------------------------------------------------------------------
-# HTTP helpers (synchronous with timing)
+# HTTP helpers (with timing)
 # ---------------------------------------------------------------------------
 def get(path: str, headers: Optional[Dict] = None) -> Tuple[httpx.Response, float]:
-    url = BASE_URL.rstrip("/") + path
     t0 = time.monotonic()
     try:
-        r = httpx.get(url, headers=headers or {}, timeout=10.0)
+        r = CLIENT.get(path, headers=headers)
     except httpx.RequestError as exc:
-        raise SystemExit(f"[FATAL] GET {url} failed: {exc}")
+        raise SystemExit(f"[FATAL] GET {path} failed: {exc}")
     ms = (time.monotonic() - t0) * 1000
     return r, ms
 
@@ -114,13 +149,11 @@ def post(
     payload: Any,
     headers: Optional[Dict] = None,
 ) -> Tuple[httpx.Response, float]:
-    url = BASE_URL.rstrip("/") + path
-    h = {"Content-Type": "application/json", **(headers or {})}
     t0 = time.monotonic()
     try:
-        r = httpx.post(url, content=json.dumps(payload), headers=h, timeout=10.0)
+        r = CLIENT.post(path, content=orjson.dumps(payload), headers=headers)
     except httpx.RequestError as exc:
-        raise SystemExit(f"[FATAL] POST {url} failed: {exc}")
+        raise SystemExit(f"[FATAL] POST {path} failed: {exc}")
     ms = (time.monotonic() - t0) * 1000
     return r, ms
 
@@ -131,29 +164,164 @@ def post_raw(
     headers: Optional[Dict] = None,
 ) -> Tuple[httpx.Response, float]:
     """POST with arbitrary body (used to test malformed JSON)."""
-    url = BASE_URL.rstrip("/") + path
-    h = {"Content-Type": "application/json", **(headers or {})}
     t0 = time.monotonic()
     try:
-        r = httpx.post(url, content=body, headers=h, timeout=10.0)
+        r = CLIENT.post(path, content=body, headers=headers)
+    except httpx.RequestError as exc:
+        raise SystemExit(f"[FATAL] POST {path} failed: {exc}")
+    ms = (time.monotonic() - t0) * 1000
+    return r, ms
+
+
+async def _timed_get(
+    client: httpx.AsyncClient, path: str
+) -> Tuple[httpx.Response, float]:
+    t0 = time.monotonic()
+    try:
+        r = await client.get(path)
     except httpx.RequestError as exc:
-        raise SystemExit(f"[FATAL] POST {url} failed: {exc}")
+        raise SystemExit(f"[FATAL] GET {path} failed: {exc}")
     ms = (time.monotonic() - t0) * 1000
     return r, ms
 
 
+def async_client() -> httpx.AsyncClient:
+    """AsyncClient for BASE_URL (HTTP/2 if available) for concurrent requests."""
+    return httpx.AsyncClient(base_url=BASE_URL, timeout=10.0, http2=HTTP2)
+
+
+async def get_many(paths: List[str]) -> List[Tuple[httpx.Response, float]]:
+    """GET several paths concurrently over one client."""
+    async with async_client() as client:
+        return await asyncio.gather(*(_timed_get(client, p) for p in paths))
+
+
+# ---------------------------------------------------------------------------
+# Response cache for read-only endpoints (bypassed by --no-cache)
+# ---------------------------------------------------------------------------
+_CACHE: Dict[str, Tuple[httpx.Response, float]] = {}
+
+
+async def cached_get(
+    client: httpx.AsyncClient, path: str
+) -> Tuple[httpx.Response, float]:
+    """GET path, reusing the first response for that path within a run.
+
+    The latency returned is that of the request which populated the cache.
+    """
+    if not USE_CACHE:
+        return await _timed_get(client, path)
+    if path not in _CACHE:
+        _CACHE[path] = await _timed_get(client, path)
+    return _CACHE[path]
+
+
+def get_cached(path: str) -> Tuple[httpx.Response, float]:
+    """Blocking cached_get() for the sequential sections, sharing its cache."""
+    if not USE_CACHE:
+        return get(path)
+    if path not in _CACHE:
+        _CACHE[path] = get(path)
+    return _CACHE[path]
+
+
 # ---------------------------------------------------------------------------
-# Async helper: poll a job URL until success / failure / timeout
+# Async helpers: follow a job until success / failure / timeout
 # ---------------------------------------------------------------------------
-async def poll_async_job(job_url: str) -> Optional[Dict]:
-    """Poll a job status URL until the job is successful or failed."""
+async def watch_job_events(
+    client: httpx.AsyncClient, job_url: str
+) -> Optional[Dict]:
+    """Follow a job's Server-Sent Events stream until it finishes.
+
+    Returns None when the server has no events endpoint (e.g. 404 / 406)
+    or the stream ends early, so the caller can fall back to polling.
+    """
+    events_url = job_url.rstrip("/") + "/events"
+    async with client.stream(
+        "GET",
+        events_url,
+        headers={"Accept": "text/event-stream"},
+        timeout=httpx.Timeout(10.0, read=None),
+    ) as r:
+        content_type = r.headers.get("Content-Type", "")
+        if r.status_code != 200 or not content_type.startswith("text/event-stream"):
+            return None
+        async for line in r.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            try:
+                data = orjson.loads(line[len("data:"):])
+            except ValueError:
+                continue
+            status = data.get("status", "")
+            if status in ("successful", "failed"):
+                return data
+            yellow(f"    … job status: {status}")
+    return None
+
+
+async def watch_job_ws(job_url: str) -> Optional[Dict]:
+    """Follow a job's status over its WebSocket endpoint until it finishes.
+
+    Returns None when websockets is not installed, the server refuses the
+    upgrade (e.g. 404 / 426) or the socket closes early, so the caller
+    can fall back to another method.
+    """
+    if websockets is None:
+        return None
+    ws_url = "ws" + job_url.rstrip("/")[len("http"):] + "/ws"
+    try:
+        async with websockets.connect(ws_url) as ws:
+            async for message in ws:
+                try:
+                    data = orjson.loads(message)
+                except ValueError:
+                    continue
+                status = data.get("status", "")
+                if status in ("successful", "failed"):
+                    return data
+                yellow(f"    … job status: {status}")
+    except (websockets.exceptions.WebSocketException, OSError):
+        pass
+    return None
+
+
+async def poll_async_job(job_url: str, use_ws: bool = True) -> Optional[Dict]:
+    """Wait until the job at job_url is successful or failed.
+
+    Follows the job over WebSocket (if use_ws) or its event stream when
+    the server offers one, and otherwise polls the status URL every
+    ASYNC_POLL_INTERVAL_S.
+    """
     deadline = time.monotonic() + ASYNC_POLL_TIMEOUT_S
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    if use_ws:
+        try:
+            data = await asyncio.wait_for(
+                watch_job_ws(job_url), timeout=ASYNC_POLL_TIMEOUT_S
+            )
+        except asyncio.TimeoutError:
+            return None  # timed out
+        if data is not None:
+            return data
+
+    async with httpx.AsyncClient(timeout=10.0, http2=HTTP2) as client:
+        try:
+            data = await asyncio.wait_for(
+                watch_job_events(client, job_url),
+                timeout=max(deadline - time.monotonic(), 0.0),
+            )
+        except asyncio.TimeoutError:
+            return None  # timed out
+        except httpx.RequestError:
+            data = None
+        if data is not None:
+            return data
+
         while time.monotonic() < deadline:
             try:
                 r = await client.get(job_url)
                 if r.status_code == 200:
-                    data = r.json()
+                    data = orjson.loads(r.content)
                     status = data.get("status", "")
                     if status == "successful":
                         return data
@@ -169,41 +337,45 @@ async def poll_async_job(job_url: str) -> Optional[Dict]:
 
 # ---------------------------------------------------------------------------
 # Test sections
+#
+# Sections 1–4 are independent reads and run concurrently (see run_parallel). Each
+# awaits its request before printing anything, so their output blocks never
+# interleave, although they may complete in any order.
 # ---------------------------------------------------------------------------
 
 
-def test_landing_page() -> None:
+async def test_landing_page(client: httpx.AsyncClient) -> None:
+    r, ms = await cached_get(client, "/")
     bold("\n== 1. Landing Page ==")
-    r, ms = get("/")
     results.record_latency("GET /", ms)
     results.check("HTTP 200", r.status_code == 200, f"got {r.status_code}")
     try:
-        body = r.json()
+        body = orjson.loads(r.content)
         results.check("Response has 'title' field", "title" in body)
         results.check("Response has 'links' field", "links" in body)
     except Exception:
         results.check("Response is valid JSON", False)
 
 
-def test_conformance() -> None:
+async def test_conformance(client: httpx.AsyncClient) -> None:
+    r, ms = await cached_get(client, "/conformance")
     bold("\n== 2. Conformance ==")
-    r, ms = get("/conformance")
     results.record_latency("GET /conformance", ms)
     results.check("HTTP 200", r.status_code == 200, f"got {r.status_code}")
     try:
-        body = r.json()
+        body = orjson.loads(r.content)
         results.check("Has 'conformsTo' list", isinstance(body.get("conformsTo"), list))
     except Exception:
         results.check("Response is valid JSON", False)
 
 
-def test_list_processes() -> None:
+async def test_list_processes(client: httpx.AsyncClient) -> None:
+    r, ms = await cached_get(client, "/processes")
     bold("\n== 3. List Processes ==")
-    r, ms = get("/processes")
     results.record_latency("GET /processes", ms)
     results.check("HTTP 200", r.status_code == 200, f"got {r.status_code}")
     try:
-        body = r.json()
+        body = orjson.loads(r.content)
         ids = [p.get("id") for p in body.get("processes", [])]
         results.check("'hello-world' listed", "hello-world" in ids)
         results.check("'geometry-buffer' listed", "geometry-buffer" in ids)
@@ -211,13 +383,13 @@ def test_list_processes() -> None:
         results.check("Response is valid JSON", False)
 
 
-def test_describe_process() -> None:
+async def test_describe_process(client: httpx.AsyncClient) -> None:
+    r, ms = await cached_get(client, "/processes/geometry-buffer")
     bold("\n== 4. Describe Process: geometry-buffer ==")
-    r, ms = get("/processes/geometry-buffer")
     results.record_latency("GET /processes/geometry-buffer", ms)
     results.check("HTTP 200", r.status_code == 200, f"got {r.status_code}")
     try:
-        body = r.json()
+        body = orjson.loads(r.content)
         results.check("Has 'id'", "id" in body)
         results.check("Has 'inputs'", "inputs" in body)
         results.check("Has 'outputs'", "outputs" in body)
@@ -236,8 +408,8 @@ def test_sync_hello_world() -> None:
     results.record_latency("POST /processes/hello-world/execution (sync)", ms)
     results.check("HTTP 200", r.status_code == 200, f"got {r.status_code}")
     try:
-        body = r.json()
-        text = json.dumps(body)
+        body = orjson.loads(r.content)
+        text = orjson.dumps(body).decode()
         results.check("Response echoes 'OGC Tester'", "OGC Tester" in text)
     except Exception:
         results.check("Response is valid JSON", False)
@@ -256,7 +428,7 @@ def test_sync_geometry_buffer_point() -> None:
     results.record_latency("POST /processes/geometry-buffer/execution (Point)", ms)
     results.check("HTTP 200", r.status_code == 200, f"got {r.status_code}")
     try:
-        body = r.json()
+        body = orjson.loads(r.content)
         results.check("Response type is 'Feature'", body.get("type") == "Feature")
         results.check(
             "Geometry is Polygon",
@@ -289,7 +461,7 @@ def test_sync_geometry_buffer_linestring() -> None:
     results.record_latency("POST /processes/geometry-buffer/execution (LineString)", ms)
     results.check("HTTP 200", r.status_code == 200, f"got {r.status_code}")
     try:
-        body = r.json()
+        body = orjson.loads(r.content)
         results.check("Response type is 'Feature'", body.get("type") == "Feature")
         results.check(
             "Geometry is Polygon",
@@ -334,6 +506,17 @@ def test_error_handling() -> None:
 
 def test_async_execute() -> None:
     bold("\n== 9. Async Execute: geometry-buffer (Polygon) ==")
+
+    # Section 4 already fetched the description; this reuses that response
+    r, ms = get_cached("/processes/geometry-buffer")
+    try:
+        job_control = orjson.loads(r.content).get("jobControlOptions", [])
+    except Exception:
+        job_control = []
+    if "async-execute" not in job_control:
+        yellow("  Skipped: process does not advertise async-execute")
+        return
+
     payload = {
         "inputs": {
             "geometry": {
@@ -381,10 +564,9 @@ def test_async_execute() -> None:
                 results_url = job_url.rstrip("/") + "/results?f=json"
                 t0 = time.monotonic()
                 try:
-                    result_r = httpx.get(
+                    result_r = CLIENT.get(
                         results_url,
                         headers={"Accept": "application/json"},
-                        timeout=10.0,
                     )
                 except httpx.RequestError as exc:
                     red(f"  Could not fetch results: {exc}")
@@ -409,7 +591,7 @@ def test_async_execute() -> None:
         # Server executed synchronously instead of asynchronously
         yellow("  Server fell back to sync execution (no Location header)")
         try:
-            body = r.json()
+            body = orjson.loads(r.content)
             results.check(
                 "Sync fallback returns Feature",
                 body.get("type") == "Feature",
@@ -430,7 +612,7 @@ def test_jobs_endpoint() -> None:
     results.record_latency("GET /jobs", ms)
     results.check("HTTP 200", r.status_code == 200, f"got {r.status_code}")
     try:
-        body = r.json()
+        body = orjson.loads(r.content)
         jobs = body.get("jobs", [])
         results.check("Response has 'jobs' list", isinstance(jobs, list))
         if jobs:
@@ -441,37 +623,52 @@ def test_jobs_endpoint() -> None:
         results.check("Response is valid JSON", False, str(exc))
 
 
-def test_response_times() -> None:
-    """Quick latency benchmark: repeat each light endpoint 5 times."""
+async def test_response_times() -> None:
+    """Quick latency benchmark: repeat each light endpoint 5 times, concurrently."""
     bold("\n== 11. Repeated Latency Benchmark (n=5) ==")
     ENDPOINTS = ["/", "/conformance", "/processes"]
-    for ep in ENDPOINTS:
-        for _ in range(5):
-            _, ms = get(ep)
-            results.record_latency(f"GET {ep}", ms)
+    paths = [ep for ep in ENDPOINTS for _ in range(5)]
+    timings = await get_many(paths)
+    for ep, (_, ms) in zip(paths, timings):
+        results.record_latency(f"GET {ep}", ms)
     green("  Benchmark done — see metrics below.")
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
+async def run_parallel() -> None:
+    """Run the independent read-only sections concurrently on one client.
+
+    Sections that execute processes stay sequential, and /jobs is checked
+    after the async job so the listing has something to verify.
+    """
+    async with async_client() as client:
+        await asyncio.gather(
+            test_landing_page(client),
+            test_conformance(client),
+            test_list_processes(client),
+            test_describe_process(client),
+        )
+
+
 def main() -> None:
     bold(f"\n{'=' * 48}")
     bold(f"  OGC API – Processes Validation Suite")
     bold(f"  Target: {BASE_URL}")
     bold(f"{'=' * 48}")
 
-    test_landing_page()
-    test_conformance()
-    test_list_processes()
-    test_describe_process()
-    test_sync_hello_world()
-    test_sync_geometry_buffer_point()
-    test_sync_geometry_buffer_linestring()
-    test_error_handling()
-    test_async_execute()
-    test_jobs_endpoint()
-    test_response_times()
+    try:
+        asyncio.run(run_parallel())
+        test_sync_hello_world()
+        test_sync_geometry_buffer_point()
+        test_sync_geometry_buffer_linestring()
+        test_error_handling()
+        test_async_execute()
+        test_jobs_endpoint()
+        asyncio.run(test_response_times())
+    finally:
+        CLIENT.close()
 
     results.summary()
     results.metrics()